@@ -1,19 +1,35 @@
 from flask import Flask, render_template, request, jsonify, session, redirect, url_for  # Web framework
-from flask_socketio import SocketIO, emit, join_room, leave_room  # Real-time WebSocket communication
+from flask_socketio import SocketIO, emit, join_room, leave_room, rooms  # Real-time WebSocket communication
 import sqlite3      # simple database for storing users and messages
 import hashlib      # For password hashing
+import hmac         # Constant-time comparison for password checks
 import pika         # RabbitMQ client (same as original CLI chat)
 import threading    # For background tasks
 import json         # Message formatting
 import os           # System operations
 from datetime import datetime  # Timestamps for messages
 import uuid         # Unique identifiers
+import time         # Expiry times for the verified-credential cache
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError  # Off-thread password hashing
 
 # INITIALIZE FLASK WEB APPLICATION
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'  # For session management
 socketio = SocketIO(app, cors_allowed_origins="*")   # Enable WebSocket with CORS
 
+# PASSWORD HASHING SETTINGS
+PASSWORD_HASH_ALGORITHM = 'pbkdf2_sha256'  # Prefix stored in front of every new password hash
+PASSWORD_HASH_ITERATIONS = 260000          # PBKDF2 work factor (slow on purpose)
+PASSWORD_SALT_BYTES = 16                   # Random per-user salt length
+PASSWORD_WORKERS = os.cpu_count() or 1     # Threads that run the slow hashing (PBKDF2 is CPU bound)
+PASSWORD_MAX_PENDING = 256                 # Max password checks running or queued at once
+PASSWORD_WAIT_SECONDS = 30                 # Longest a login waits for its check before giving up
+CREDENTIAL_CACHE_SECONDS = 60              # How long a verified login is remembered
+
+# EPHEMERAL EVENT SETTINGS (typing indicators / read receipts)
+EPHEMERAL_FLUSH_SECONDS = 0.25  # How often coalesced events are sent out
+EPHEMERAL_TTL_SECONDS = 3       # Events older than this are dropped instead of sent
+
 # DATABASE SETUP - CREATE TABLES FOR USERS, MESSAGES, AND ROOMS
 def init_db():
     """Initialize SQLite database with required tables and test users"""
@@ -47,17 +63,149 @@ def init_db():
     # Create default test users for demonstration (password: password123)
     try:
         c.execute("INSERT INTO users (username, password, display_name) VALUES (?, ?, ?)",
-                 ('alice', hashlib.md5('password123'.encode()).hexdigest(), 'Alice Johnson'))
+                 ('alice', hash_password('password123'), 'Alice Johnson'))
         c.execute("INSERT INTO users (username, password, display_name) VALUES (?, ?, ?)",
-                 ('bob', hashlib.md5('password123'.encode()).hexdigest(), 'Bob Smith'))
+                 ('bob', hash_password('password123'), 'Bob Smith'))
         c.execute("INSERT INTO users (username, password, display_name) VALUES (?, ?, ?)",
-                 ('carol', hashlib.md5('password123'.encode()).hexdigest(), 'Carol Davis'))
+                 ('carol', hash_password('password123'), 'Carol Davis'))
     except sqlite3.IntegrityError:
         pass  # Users already exist in database
     
     conn.commit()
     conn.close()
 
+# PASSWORD HASHING - SALTED PBKDF2 WITH UPGRADE FROM OLD MD5 VALUES
+def hash_password(password, salt=None, iterations=PASSWORD_HASH_ITERATIONS):
+    """Hash a password as 'pbkdf2_sha256$iterations$salt$hash'"""
+    if salt is None:
+        salt = os.urandom(PASSWORD_SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+    return f"{PASSWORD_HASH_ALGORITHM}${iterations}${salt.hex()}${digest.hex()}"
+
+def is_legacy_hash(stored_hash):
+    """Old accounts store a bare unsalted MD5 hex digest"""
+    return '$' not in stored_hash
+
+def check_password(password, stored_hash):
+    """Check a password against a stored hash - returns (matches, needs_rehash)"""
+    if is_legacy_hash(stored_hash):
+        legacy = hashlib.md5(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy, stored_hash), True
+    
+    try:
+        algorithm, iterations, salt, expected = stored_hash.split('$')
+        iterations = int(iterations)
+        salt = bytes.fromhex(salt)
+        if iterations <= 0:
+            raise ValueError('iterations must be positive')
+    except ValueError:
+        return False, False
+    if algorithm != PASSWORD_HASH_ALGORITHM:
+        return False, False
+    
+    actual = hash_password(password, salt, iterations).split('$')[3]
+    return hmac.compare_digest(actual, expected), iterations != PASSWORD_HASH_ITERATIONS
+
+def check_and_upgrade(password, stored_hash):
+    """Check a password and, if it matches an old-style hash, make the new hash - returns (matches, new_hash)"""
+    matches, needs_rehash = check_password(password, stored_hash)
+    if matches and needs_rehash:
+        return True, hash_password(password)
+    return matches, None
+
+# Hash checked for unknown usernames so they take as long as real ones
+DUMMY_HASH = hash_password(os.urandom(16).hex())
+
+class LoginBusyError(Exception):
+    """Raised when too many logins are already waiting on password checks"""
+
+class PasswordVerifier:
+    """Runs slow password checks on a bounded thread pool.
+    
+    The request thread still waits for its result; the pool only caps how
+    many PBKDF2 runs happen at once (one per CPU) and how many may queue.
+    - At most PASSWORD_MAX_PENDING checks may be running or queued; a login
+      that cannot get its answer within PASSWORD_WAIT_SECONDS gets LoginBusyError.
+    - Logins for the same user with the same password that arrive while a
+      check is running share that check instead of starting their own.
+    - A successful check is remembered for CREDENTIAL_CACHE_SECONDS so a client
+      reconnecting over and over does not pay for PBKDF2 every time. The cache
+      keeps a keyed fingerprint of the password, never the password itself, and
+      an entry only counts while the stored hash is unchanged.
+    """
+    def __init__(self, workers=PASSWORD_WORKERS, max_pending=PASSWORD_MAX_PENDING,
+                 cache_seconds=CREDENTIAL_CACHE_SECONDS, wait_seconds=PASSWORD_WAIT_SECONDS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password')
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.cache_seconds = cache_seconds
+        self.wait_seconds = wait_seconds
+        self.cache_key = os.urandom(32)  # Fingerprints are only valid inside this process
+        self.cache = {}                  # username -> (stored_hash, fingerprint, expires_at)
+        self.in_flight = {}              # (username, fingerprint, stored_hash) -> running check
+        self.lock = threading.Lock()
+    
+    def _fingerprint(self, username, password):
+        """Fast keyed fingerprint of a credential pair for the cache"""
+        return hmac.new(self.cache_key, f"{username}\0{password}".encode(), hashlib.sha256).digest()
+    
+    def _cached(self, username, fingerprint, stored_hash):
+        """True if this exact credential was verified recently"""
+        with self.lock:
+            entry = self.cache.get(username)
+            if entry is None:
+                return False
+            if entry[2] < time.monotonic() or entry[0] != stored_hash:
+                del self.cache[username]
+                return False
+        return hmac.compare_digest(entry[1], fingerprint)
+    
+    def _finish(self, key, future):
+        """Runs when a check completes - free its slot and cache a success"""
+        username, fingerprint, stored_hash = key
+        self.slots.release()
+        with self.lock:
+            self.in_flight.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+            matches, new_hash = future.result()
+            if matches:
+                self.cache[username] = (new_hash or stored_hash, fingerprint,
+                                        time.monotonic() + self.cache_seconds)
+    
+    def verify(self, username, password, stored_hash):
+        """Check a password - returns (matches, new_hash); new_hash is set when the stored value should be upgraded"""
+        fingerprint = self._fingerprint(username, password)
+        if self._cached(username, fingerprint, stored_hash):
+            return True, None
+        
+        deadline = time.monotonic() + self.wait_seconds
+        key = (username, fingerprint, stored_hash)
+        with self.lock:
+            future = self.in_flight.get(key)
+        
+        if future is None:
+            if not self.slots.acquire(timeout=self.wait_seconds):
+                raise LoginBusyError()
+            with self.lock:
+                future = self.in_flight.get(key)
+                if future is None:
+                    future = self.executor.submit(check_and_upgrade, password, stored_hash)
+                    self.in_flight[key] = future
+                    started = True
+                else:
+                    started = False  # Another login started the same check meanwhile
+            if started:
+                future.add_done_callback(lambda done: self._finish(key, done))
+            else:
+                self.slots.release()
+        
+        try:
+            return future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            raise LoginBusyError()
+
+password_verifier = PasswordVerifier()  # Shared by every login request
+
 # RABBITMQ INTEGRATION - SAME MIDDLEWARE AS ORIGINAL CLI CHAT
 # Reference: Extends functionality from Task 1 chat_app.py
 class RabbitMQManager:
@@ -94,6 +242,124 @@ class RabbitMQManager:
 
 rabbitmq_manager = RabbitMQManager()  # Initialize RabbitMQ connection
 
+# EPHEMERAL EVENT LANE - TYPING INDICATORS AND READ RECEIPTS
+# These events never touch SQLite or RabbitMQ. They are kept in memory,
+# coalesced per user per room (latest wins) and sent out in small batches.
+class EphemeralEventLane:
+    """Best-effort, in-memory delivery for short-lived room events.
+    
+    - Typing: only the latest state per (room, user) is kept until the next
+      flush, so a user typing fast produces at most one event per flush.
+    - Read receipts: each room keeps a watermark map {username: last read
+      message id} that only moves forward and never past the room's newest
+      message; a flush sends the whole map for rooms that changed.
+    - Only users currently in a room can set watermarks there, a user's
+      watermark is dropped when they leave, and all state for a room is
+      dropped when its last user leaves.
+    - Anything waiting longer than the TTL is dropped, not delivered late.
+    """
+    def __init__(self, emit_fn, flush_seconds=EPHEMERAL_FLUSH_SECONDS, ttl_seconds=EPHEMERAL_TTL_SECONDS):
+        self.emit_fn = emit_fn          # emit_fn(event, data, room)
+        self.flush_seconds = flush_seconds
+        self.ttl_seconds = ttl_seconds
+        self.pending_typing = {}        # (room, username) -> (payload, queued_at)
+        self.members = {}               # room -> {username: open connections}
+        self.latest_ids = {}            # room -> newest message id
+        self.watermarks = {}            # room -> {username: message_id}
+        self.dirty_rooms = {}           # room -> first change time since last flush
+        self.lock = threading.Lock()
+    
+    def publish_typing(self, room, username, display_name, is_typing):
+        """Queue a typing indicator - replaces any unsent one from the same user"""
+        payload = {'username': username, 'display_name': display_name, 'typing': bool(is_typing)}
+        with self.lock:
+            self.pending_typing[(room, username)] = (payload, time.monotonic())
+    
+    def join(self, room, username, latest_id):
+        """Track a user connection entering a room, with the room's newest message id"""
+        with self.lock:
+            room_members = self.members.setdefault(room, {})
+            room_members[username] = room_members.get(username, 0) + 1
+            self.latest_ids[room] = max(self.latest_ids.get(room, 0), latest_id or 0)
+    
+    def leave(self, room, username):
+        """Track a user connection leaving a room and drop state nobody needs"""
+        with self.lock:
+            room_members = self.members.get(room)
+            if not room_members or username not in room_members:
+                return
+            room_members[username] -= 1
+            if room_members[username] > 0:
+                return
+            del room_members[username]
+            if not room_members:
+                del self.members[room]
+                self.latest_ids.pop(room, None)
+                self.watermarks.pop(room, None)
+                self.dirty_rooms.pop(room, None)
+            elif self.watermarks.get(room, {}).pop(username, None) is not None:
+                self.dirty_rooms.setdefault(room, time.monotonic())
+    
+    def note_message(self, room, message_id):
+        """Record a new message so read receipts can be checked against it"""
+        with self.lock:
+            if room in self.latest_ids:
+                self.latest_ids[room] = max(self.latest_ids[room], message_id)
+    
+    def mark_read(self, room, username, message_id):
+        """Move a user's read watermark forward in a room"""
+        with self.lock:
+            if username not in self.members.get(room, {}):
+                return
+            message_id = min(message_id, self.latest_ids.get(room, 0))
+            room_marks = self.watermarks.setdefault(room, {})
+            if message_id <= room_marks.get(username, 0):
+                return
+            room_marks[username] = message_id
+            self.dirty_rooms.setdefault(room, time.monotonic())
+    
+    def get_watermarks(self, room):
+        """Current read watermarks for a room (for clients that just joined)"""
+        with self.lock:
+            return dict(self.watermarks.get(room, {}))
+    
+    def flush(self):
+        """Send everything queued since the last flush - returns number of events sent"""
+        now = time.monotonic()
+        with self.lock:
+            typing, self.pending_typing = self.pending_typing, {}
+            dirty, self.dirty_rooms = self.dirty_rooms, {}
+            receipts = [(room, dict(self.watermarks.get(room, {}))) for room, queued_at in dirty.items()
+                        if now - queued_at <= self.ttl_seconds]
+        
+        sent = 0
+        typing_by_room = {}
+        for (room, _), (payload, queued_at) in typing.items():
+            if now - queued_at <= self.ttl_seconds:
+                typing_by_room.setdefault(room, []).append(payload)
+        for room, payloads in typing_by_room.items():
+            sent += self._emit('typing', {'room': room, 'users': payloads}, room)
+        for room, marks in receipts:
+            sent += self._emit('read_watermarks', {'room': room, 'watermarks': marks}, room)
+        return sent
+    
+    def _emit(self, event, data, room):
+        """Emit one event, ignoring delivery errors (best effort)"""
+        try:
+            self.emit_fn(event, data, room)
+            return 1
+        except Exception as e:
+            print(f"Dropped ephemeral '{event}' event for {room}: {e}")
+            return 0
+    
+    def run(self):
+        """Flush forever - started as a Socket.IO background task"""
+        while True:
+            socketio.sleep(self.flush_seconds)
+            self.flush()
+
+ephemeral_lane = EphemeralEventLane(lambda event, data, room: socketio.emit(event, data, to=room))
+
 # HELPER FUNCTIONS FOR DATABASE OPERATIONS
 def get_user(username):
     """Retrieve user information from database"""
@@ -104,20 +370,39 @@ def get_user(username):
     conn.close()
     return user
 
+def update_user_password(username, password_hash):
+    """Store a new password hash for a user (used to upgrade old MD5 hashes)"""
+    conn = sqlite3.connect('chat.db')
+    c = conn.cursor()
+    c.execute("UPDATE users SET password = ? WHERE username = ?", (password_hash, username))
+    conn.commit()
+    conn.close()
+
 def save_message(room_name, username, message):
-    """Save chat message to database for persistence"""
+    """Save chat message to database for persistence - returns the new message id"""
     conn = sqlite3.connect('chat.db')
     c = conn.cursor()
     c.execute("INSERT INTO messages (room_name, username, message) VALUES (?, ?, ?)",
              (room_name, username, message))
+    message_id = c.lastrowid
     conn.commit()
     conn.close()
+    return message_id
+
+def get_latest_message_id(room_name):
+    """Id of the newest message in a room (0 if the room has none)"""
+    conn = sqlite3.connect('chat.db')
+    c = conn.cursor()
+    c.execute("SELECT MAX(id) FROM messages WHERE room_name = ?", (room_name,))
+    latest_id = c.fetchone()[0]
+    conn.close()
+    return latest_id or 0
 
 def get_room_messages(room_name, limit=50):
     """Load previous messages from database (same as message history feature)"""
     conn = sqlite3.connect('chat.db')
     c = conn.cursor()
-    c.execute("""SELECT m.username, u.display_name, m.message, m.timestamp 
+    c.execute("""SELECT m.username, u.display_name, m.message, m.timestamp, m.id 
                  FROM messages m 
                  JOIN users u ON m.username = u.username 
                  WHERE m.room_name = ? 
@@ -156,11 +441,22 @@ def login():
         if not username or not password:
             return jsonify({'success': False, 'message': 'Username and password required'})
         
-        # Check credentials 
+        # Check credentials on the password thread pool
+        # (unknown users are checked against a dummy hash so they take as long)
         user = get_user(username)
-        hashed_password = hashlib.md5(password.encode()).hexdigest()
+        try:
+            valid, new_hash = password_verifier.verify(username, password, user[2] if user else DUMMY_HASH)
+        except LoginBusyError:
+            return jsonify({'success': False, 'message': 'Server busy, please try again'}), 503
+        
+        if not user:
+            return jsonify({'success': False, 'message': 'Invalid credentials'})
+        
+        # Upgrade old MD5 passwords to salted PBKDF2 on successful login
+        if new_hash:
+            update_user_password(username, new_hash)
         
-        if user and user[2] == hashed_password:
+        if valid:
             # Create session for authenticated user
             session['username'] = username
             session['display_name'] = user[3]
@@ -276,6 +572,8 @@ def chat():
             .send-button { padding: 8px 15px; background: #0078d4; color: white; border: none; border-radius: 3px; cursor: pointer; }
             .send-button:hover { background: #106ebe; }
             
+            .room-status { padding: 2px 10px; height: 16px; color: #666; font-size: 10px; font-style: italic; }
+            
             .notification { position: fixed; top: 20px; right: 20px; background: #fffbe6; border: 1px solid #ffd666; padding: 10px; border-radius: 5px; box-shadow: 0 2px 10px rgba(0,0,0,0.2); z-index: 1000; }
         </style>
     </head>
@@ -308,6 +606,7 @@ def chat():
                 </div>
                 
                 <div class="messages" id="messages"></div>
+                <div class="room-status"><span id="typingStatus"></span> <span id="readStatus"></span></div>
                 
                 <div class="input-area">
                     <input type="text" class="message-input" id="messageInput" placeholder="Type your message here..." maxlength="500">
@@ -322,6 +621,11 @@ def chat():
             let currentRoom = 'general';
             let username = '';
             let displayName = '';
+            let lastMessageId = 0;
+            let typingSent = 0;
+            let typingTimer = null;
+            let typingUsers = {};      // username -> {name, timer}
+            let readWatermarks = {};   // username -> last message id they have read
             
             // Initialize
             document.addEventListener('DOMContentLoaded', function() {
@@ -333,6 +637,9 @@ def chat():
                     if (e.key === 'Enter') sendMessage();
                 });
                 
+                document.getElementById('messageInput').addEventListener('input', notifyTyping);
+                window.addEventListener('focus', sendReadReceipt);
+                
                 document.getElementById('roomSelect').addEventListener('change', function() {
                     const newRoom = this.value;
                     switchRoom(newRoom);
@@ -378,10 +685,15 @@ def chat():
             }
             
             function switchRoom(newRoom) {
+                stopTyping();
                 socket.emit('leave_room', {room: currentRoom});
                 currentRoom = newRoom;
                 document.getElementById('currentRoom').textContent = newRoom;
                 document.getElementById('roomSelect').value = newRoom;
+                lastMessageId = 0;
+                clearAllTyping();
+                readWatermarks = {};
+                updateReadStatus();
                 joinRoom(newRoom);
                 document.getElementById('messages').innerHTML = '';
             }
@@ -395,8 +707,11 @@ def chat():
                     
                     messages.forEach(msg => {
                         displayMessage(msg[0], msg[1], msg[2], msg[3], false);
+                        lastMessageId = Math.max(lastMessageId, msg[4]);
                     });
                     messagesDiv.scrollTop = messagesDiv.scrollHeight;
+                    updateReadStatus();
+                    sendReadReceipt();
                 } catch (error) {
                     console.error('Error loading messages:', error);
                 }
@@ -412,6 +727,67 @@ def chat():
                         message: message
                     });
                     input.value = '';
+                    stopTyping();
+                }
+            }
+            
+            // Typing indicators - sent at most once a second while typing
+            function notifyTyping() {
+                const now = Date.now();
+                if (now - typingSent > 1000) {
+                    socket.emit('typing', {room: currentRoom, typing: true});
+                    typingSent = now;
+                }
+                clearTimeout(typingTimer);
+                typingTimer = setTimeout(stopTyping, 3000);
+            }
+            
+            function stopTyping() {
+                clearTimeout(typingTimer);
+                if (typingSent) {
+                    socket.emit('typing', {room: currentRoom, typing: false});
+                    typingSent = 0;
+                }
+            }
+            
+            // Typing events are best effort, so each user's indicator expires on its own
+            function setTyping(user, name) {
+                if (typingUsers[user]) clearTimeout(typingUsers[user].timer);
+                typingUsers[user] = {name: name, timer: setTimeout(() => clearTyping(user), 5000)};
+            }
+            
+            function clearTyping(user) {
+                if (!typingUsers[user]) return;
+                clearTimeout(typingUsers[user].timer);
+                delete typingUsers[user];
+                updateTypingStatus();
+            }
+            
+            function clearAllTyping() {
+                Object.values(typingUsers).forEach(entry => clearTimeout(entry.timer));
+                typingUsers = {};
+                updateTypingStatus();
+            }
+            
+            function updateTypingStatus() {
+                const names = Object.values(typingUsers).map(entry => entry.name);
+                document.getElementById('typingStatus').textContent =
+                    names.length ? `${names.join(', ')} ${names.length > 1 ? 'are' : 'is'} typing...` : '';
+            }
+            
+            // Read receipts - show who has seen the newest message in the room
+            function updateReadStatus() {
+                const seenBy = Object.entries(readWatermarks)
+                    .filter(([user, id]) => user !== username && lastMessageId && id >= lastMessageId)
+                    .map(([user]) => user);
+                document.getElementById('readStatus').textContent =
+                    seenBy.length ? `Seen by ${seenBy.join(', ')}` : '';
+            }
+            
+            // Read receipts - tell the room the newest message we have seen
+            function sendReadReceipt() {
+                if (lastMessageId && document.hasFocus()) {
+                    socket.emit('read_receipt', {room: currentRoom, message_id: lastMessageId});
                 }
             }
             
@@ -456,6 +832,26 @@ def chat():
             // Socket events
             socket.on('message', function(data) {
                 displayMessage(data.username, data.display_name, data.message, data.timestamp, true);
+                lastMessageId = Math.max(lastMessageId, data.id);
+                clearTyping(data.username);
+                updateReadStatus();
+                sendReadReceipt();
+            });
+            
+            socket.on('typing', function(data) {
+                if (data.room !== currentRoom) return;
+                data.users.forEach(user => {
+                    if (user.username === username) return;
+                    if (user.typing) setTyping(user.username, user.display_name);
+                    else clearTyping(user.username);
+                });
+                updateTypingStatus();
+            });
+            
+            socket.on('read_watermarks', function(data) {
+                if (data.room !== currentRoom) return;
+                readWatermarks = data.watermarks;
+                updateReadStatus();
             });
             
             socket.on('user_joined', function(data) {
@@ -528,6 +924,8 @@ def handle_join_room(data):
         return
     
     room = data['room']
+    if room not in rooms():
+        ephemeral_lane.join(room, session['username'], get_latest_message_id(room))
     join_room(room)  # Add user to WebSocket room
     
     # Create RabbitMQ exchange for room (same as CLI chat room creation)
@@ -538,6 +936,9 @@ def handle_join_room(data):
         'username': session['username'],
         'display_name': session['display_name']
     }, room=room, include_self=False)
+    
+    # Send current read receipts so the new client starts up to date
+    emit('read_watermarks', {'room': room, 'watermarks': ephemeral_lane.get_watermarks(room)})
 
 @socketio.on('leave_room')
 def handle_leave_room(data):
@@ -546,6 +947,8 @@ def handle_leave_room(data):
         return
     
     room = data['room']
+    if room in rooms():
+        ephemeral_lane.leave(room, session['username'])
     leave_room(room)
     
     emit('user_left', {
@@ -553,6 +956,16 @@ def handle_leave_room(data):
         'display_name': session['display_name']
     }, room=room)
 
+@socketio.on('disconnect')
+def handle_disconnect():
+    """Drop typing / read receipt state for rooms a closed connection was in"""
+    if 'username' not in session:
+        return
+    
+    for room in rooms():
+        if room != request.sid:  # Every connection is also in a private room named after it
+            ephemeral_lane.leave(room, session['username'])
+
 @socketio.on('send_message')
 def handle_send_message(data):
     """Handle sending message to chat room - core functionality"""
@@ -566,10 +979,11 @@ def handle_send_message(data):
     timestamp = datetime.now().isoformat()
     
     # Save message to database for persistence (extends CLI functionality)
-    save_message(room, username, message)
+    message_id = save_message(room, username, message)
     
     # Send message via RabbitMQ (same middleware as original CLI chat)
     message_data = {
+        'id': message_id,
         'username': username,
         'display_name': display_name,
         'message': message,
@@ -577,10 +991,33 @@ def handle_send_message(data):
         'room': room
     }
     rabbitmq_manager.send_message(room, message_data)
+    ephemeral_lane.note_message(room, message_id)
     
     # Broadcast to all WebSocket clients in room (real-time delivery)
     emit('message', message_data, room=room)
 
+# EPHEMERAL EVENTS - NOT SAVED TO DATABASE, NOT SENT THROUGH RABBITMQ
+@socketio.on('typing')
+def handle_typing(data):
+    """Queue a typing indicator for the room (coalesced, best effort)"""
+    if 'username' not in session or data.get('room') not in rooms():
+        return
+    
+    ephemeral_lane.publish_typing(data['room'], session['username'],
+                                  session['display_name'], data.get('typing', True))
+
+@socketio.on('read_receipt')
+def handle_read_receipt(data):
+    """Record the last message a user has seen in a room"""
+    if 'username' not in session or data.get('room') not in rooms():
+        return
+    
+    try:
+        message_id = int(data['message_id'])
+    except (KeyError, TypeError, ValueError):
+        return
+    ephemeral_lane.mark_read(data['room'], session['username'], message_id)
+
 if __name__ == '__main__':
     # Initialize database with tables and test users
     init_db()
@@ -599,5 +1036,8 @@ if __name__ == '__main__':
     print("docker run -it --rm --name rabbitmq -p 5672:5672 -p 15672:15672 rabbitmq:3-management")
     print("=" * 50)
     
+    # Start the typing / read receipt flusher
+    socketio.start_background_task(ephemeral_lane.run)
+    
     # Start Flask application with WebSocket support
     socketio.run(app, debug=True, host='0.0.0.0', port=5000)
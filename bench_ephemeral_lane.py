@@ -0,0 +1,111 @@
+# EPHEMERAL LANE BENCHMARK
+# Measures the latency of the durable message path (SQLite write + RabbitMQ
+# publish, same calls as handle_send_message) while lots of users are typing:
+#   1. no typing traffic
+#   2. typing traffic through the EphemeralEventLane
+#   3. typing traffic sent like normal messages (what we want to avoid)
+# Runs in a temporary folder so the real chat.db is not touched.
+#
+# Run:  python bench_ephemeral_lane.py [messages] [typing_users]
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import app
+from app import EphemeralEventLane
+
+MESSAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+TYPING_USERS = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+ROOMS = ['general', 'random', 'tech', 'gaming']
+KEYSTROKE_SECONDS = 0.02  # Each typist sends 50 typing events a second (a very fast typist)
+
+# The shared pika BlockingConnection is not thread-safe, so publishes from
+# several benchmark threads must take turns on it
+publish_lock = threading.Lock()
+
+def send_durable(room, username, message):
+    """The durable path from handle_send_message (without the Socket.IO emit)"""
+    message_id = app.save_message(room, username, message)
+    with publish_lock:
+        app.rabbitmq_manager.send_message(room, {'id': message_id, 'username': username,
+                                                 'message': message, 'room': room})
+
+def measure_durable_path():
+    """Send MESSAGES messages one after another and return sorted latencies"""
+    latencies = []
+    for i in range(MESSAGES):
+        started = time.perf_counter()
+        send_durable(ROOMS[i % len(ROOMS)], 'alice', f"message {i}")
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return latencies
+
+def run_with_typing(typing_fn):
+    """Measure the durable path while TYPING_USERS threads keep calling typing_fn"""
+    stop = threading.Event()
+    counts = [0] * TYPING_USERS
+
+    def typist(n):
+        room = ROOMS[n % len(ROOMS)]
+        user = f"typist{n}"
+        while not stop.is_set():
+            typing_fn(room, user, counts[n])
+            counts[n] += 1
+            time.sleep(KEYSTROKE_SECONDS)
+
+    threads = [threading.Thread(target=typist, args=(n,)) for n in range(TYPING_USERS)]
+    for t in threads:
+        t.start()
+    try:
+        latencies = measure_durable_path()
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+    return latencies, sum(counts)
+
+def report(name, latencies, typing_events=0, delivered=None):
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    extra = f"  typing in {typing_events:>8}" if typing_events else ""
+    if delivered is not None:
+        extra += f"  delivered {delivered:>6}"
+    print(f"{name:<26} p50 {p50:>7.2f}ms  p99 {p99:>7.2f}ms{extra}")
+
+if __name__ == '__main__':
+    workdir = tempfile.mkdtemp(prefix='chat_bench_')
+    os.chdir(workdir)
+    app.init_db()
+
+    print("=" * 50)
+    print(f"Durable path: {MESSAGES} messages, {TYPING_USERS} typing users")
+    print("=" * 50)
+
+    report("no typing traffic", measure_durable_path())
+
+    delivered = []
+    lane = EphemeralEventLane(lambda event, data, room: delivered.append(event))
+    flushing = threading.Event()
+
+    def flusher():
+        while not flushing.is_set():
+            time.sleep(lane.flush_seconds)
+            lane.flush()
+
+    flush_thread = threading.Thread(target=flusher)
+    flush_thread.start()
+    latencies, typed = run_with_typing(
+        lambda room, user, n: lane.publish_typing(room, user, user, n % 2 == 0))
+    flushing.set()
+    flush_thread.join()
+    lane.flush()
+    report("typing via ephemeral lane", latencies, typed, len(delivered))
+
+    latencies, typed = run_with_typing(
+        lambda room, user, n: send_durable(room, user, '[typing]'))
+    report("typing as messages", latencies, typed)
+
+    print(f"\nDatabase used: {os.path.join(workdir, 'chat.db')}")
@@ -0,0 +1,82 @@
+# LOGIN STORM BENCHMARK
+# Simulates many clients reconnecting at once and logging in again and again.
+# Compares checking passwords straight on the request threads against the
+# shared PasswordVerifier (thread pool where identical logins share one
+# check, with and without the verified-credential cache).
+#
+# Run:  python bench_login_storm.py [clients] [logins_per_client]
+
+import sys
+import threading
+import time
+
+from app import hash_password, check_password, PasswordVerifier, LoginBusyError
+
+CLIENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+LOGINS_PER_CLIENT = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+USERS = {f"user{i}": hash_password('password123') for i in range(10)}
+
+def run_storm(login):
+    """Fire CLIENTS threads that each log in LOGINS_PER_CLIENT times"""
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+    start_gate = threading.Event()
+
+    def client(n):
+        username = f"user{n % len(USERS)}"
+        start_gate.wait()
+        for _ in range(LOGINS_PER_CLIENT):
+            started = time.perf_counter()
+            ok = login(username, 'password123')
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    failures.append(username)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(CLIENTS)]
+    for t in threads:
+        t.start()
+    started = time.perf_counter()
+    start_gate.set()
+    for t in threads:
+        t.join()
+    total = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'logins': len(latencies),
+        'failed': len(failures),
+        'seconds': total,
+        'per_second': len(latencies) / total,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+def inline_login(username, password):
+    """Every request thread runs PBKDF2 itself (no pool, no cache)"""
+    return check_password(password, USERS[username])[0]
+
+def make_pooled_login(cache_seconds):
+    verifier = PasswordVerifier(cache_seconds=cache_seconds)
+
+    def pooled_login(username, password):
+        try:
+            return verifier.verify(username, password, USERS[username])[0]
+        except LoginBusyError:
+            return False
+    return pooled_login
+
+def report(name, result):
+    print(f"{name:<22} {result['logins']:>6} logins  {result['failed']:>4} failed  "
+          f"{result['seconds']:>7.2f}s  {result['per_second']:>8.1f}/s  "
+          f"p50 {result['p50_ms']:>8.1f}ms  p99 {result['p99_ms']:>8.1f}ms")
+
+if __name__ == '__main__':
+    print("=" * 50)
+    print(f"Login storm: {CLIENTS} clients x {LOGINS_PER_CLIENT} logins, {len(USERS)} accounts")
+    print("=" * 50)
+    report("inline PBKDF2", run_storm(inline_login))
+    report("pool, shared checks", run_storm(make_pooled_login(cache_seconds=0)))
+    report("pool + cache", run_storm(make_pooled_login(cache_seconds=60)))